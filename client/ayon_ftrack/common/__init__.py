@@ -41,6 +41,8 @@ __all__ = (
     "map_ftrack_users_to_ayon_users",
 
     "get_ayon_attr_configs",
+    "invalidate_ayon_attr_configs_cache",
+    "iter_custom_attribute_values",
     "query_custom_attribute_values",
     "get_custom_attributes_by_entity_id",
     "default_custom_attributes_definition",
@@ -103,6 +105,8 @@ from .users import map_ftrack_users_to_ayon_users
 
 from .custom_attributes import (
     get_ayon_attr_configs,
+    invalidate_ayon_attr_configs_cache,
+    iter_custom_attribute_values,
     query_custom_attribute_values,
     get_custom_attributes_by_entity_id,
     default_custom_attributes_definition,
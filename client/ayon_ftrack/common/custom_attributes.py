@@ -1,11 +1,78 @@
 import os
 import json
+import time
 import itertools
 import collections
+import threading
+
+import ftrack_api.inspection
 
 from .lib import join_filter_values, create_chunks
 from .constants import CUST_ATTR_GROUP
 
+# Maximum number of combinations of entity ids and attribute ids
+#   queried in single custom attribute values query
+CUST_ATTR_VALUES_QUERY_LIMIT = 5000
+# How long (in seconds) are queried attribute configurations cached
+ATTR_CONFIGS_CACHE_TIMEOUT = 60
+
+# Default keys queried for attribute configurations
+_DEFAULT_ATTR_CONFIG_QUERY_KEYS = frozenset({
+    "id",
+    "key",
+    "entity_type",
+    "object_type_id",
+    "is_hierarchical",
+    "default",
+})
+# Joined filter of custom attribute groups used for attribute configurations
+_CUST_ATTR_GROUPS_JOINED = join_filter_values({"openpype", CUST_ATTR_GROUP})
+
+# Attribute configurations are cached on the session object, so the cache
+#   is released together with the session
+_ATTR_CONFIGS_CACHE_ATTR = "_ayon_attr_configs_cache"
+_ATTR_CONFIGS_CACHE_LOCK = threading.Lock()
+
+
+def invalidate_ayon_attr_configs_cache(session):
+    """Invalidate cached custom attribute configurations of a session.
+
+    Should be called after custom attribute configurations were changed.
+
+    Args:
+        session (ftrack_api.Session): Session which cache is invalidated.
+    """
+    with _ATTR_CONFIGS_CACHE_LOCK:
+        session_cache = getattr(session, _ATTR_CONFIGS_CACHE_ATTR, None)
+        if session_cache:
+            session_cache.clear()
+
+
+def _are_entities_in_session_cache(session, entities):
+    """Check if entities are still in local cache of the session.
+
+    Event handlers clear session local cache before each event, cached
+    entities from previous event should not be used after that.
+
+    Args:
+        session (ftrack_api.Session): Connected ftrack session.
+        entities (Iterable[ftrack_api.Entity]): Entities to check.
+
+    Returns:
+        bool: All entities are in session local cache.
+    """
+    local_cache = session._local_cache
+    cache_key_maker = session.cache_key_maker
+    for entity in entities:
+        cache_key = cache_key_maker.key(
+            ftrack_api.inspection.identity(entity)
+        )
+        try:
+            local_cache.get(cache_key)
+        except KeyError:
+            return False
+    return True
+
 
 def get_ayon_attr_configs(session, query_keys=None, split_hierarchical=True):
     """Query custom attribute configurations from ftrack server.
@@ -21,40 +88,107 @@ def get_ayon_attr_configs(session, query_keys=None, split_hierarchical=True):
         Union[List[Any], Tuple[List[Any], List[Any]]: ftrack custom attributes.
     """
 
-    custom_attributes = []
-    hier_custom_attributes = []
     if not query_keys:
-        query_keys = {
-            "id",
-            "key",
-            "entity_type",
-            "object_type_id",
-            "is_hierarchical",
-            "default"
-        }
+        query_keys = _DEFAULT_ATTR_CONFIG_QUERY_KEYS
 
     query_keys = set(query_keys)
     if split_hierarchical:
         query_keys.add("is_hierarchical")
 
+    cache_key = (frozenset(query_keys), split_hierarchical)
+    with _ATTR_CONFIGS_CACHE_LOCK:
+        session_cache = getattr(session, _ATTR_CONFIGS_CACHE_ATTR, None)
+        if session_cache is None:
+            session_cache = {}
+            setattr(session, _ATTR_CONFIGS_CACHE_ATTR, session_cache)
+
+        # Remove expired items
+        current_time = time.time()
+        for key, item in tuple(session_cache.items()):
+            if item[0] < current_time:
+                session_cache.pop(key)
+        cached_item = session_cache.get(cache_key)
+
+    if cached_item is not None:
+        _, custom_attributes, hier_custom_attributes = cached_item
+        if _are_entities_in_session_cache(
+            session,
+            itertools.chain(custom_attributes, hier_custom_attributes)
+        ):
+            # Return copies so callers can't modify cached lists
+            if not split_hierarchical:
+                return list(custom_attributes)
+            return list(custom_attributes), list(hier_custom_attributes)
+
     cust_attrs_query = (
         "select {}"
         " from CustomAttributeConfiguration"
         " where group.name in ({})"
-    ).format(
-        ", ".join(query_keys),
-        join_filter_values({"openpype", CUST_ATTR_GROUP})
-    )
+    ).format(", ".join(query_keys), _CUST_ATTR_GROUPS_JOINED)
     all_attrs = session.query(cust_attrs_query).all()
-    for cust_attr in all_attrs:
-        if split_hierarchical and cust_attr["is_hierarchical"]:
-            hier_custom_attributes.append(cust_attr)
-        else:
-            custom_attributes.append(cust_attr)
+    if split_hierarchical:
+        hier_flags = [cust_attr["is_hierarchical"] for cust_attr in all_attrs]
+        hier_custom_attributes = list(
+            itertools.compress(all_attrs, hier_flags)
+        )
+        custom_attributes = list(itertools.compress(
+            all_attrs, [not is_hier for is_hier in hier_flags]
+        ))
+    else:
+        custom_attributes = list(all_attrs)
+        hier_custom_attributes = []
+
+    with _ATTR_CONFIGS_CACHE_LOCK:
+        session_cache[cache_key] = (
+            time.time() + ATTR_CONFIGS_CACHE_TIMEOUT,
+            custom_attributes,
+            hier_custom_attributes,
+        )
 
     if not split_hierarchical:
-        return custom_attributes
-    return custom_attributes, hier_custom_attributes
+        return list(custom_attributes)
+    return list(custom_attributes), list(hier_custom_attributes)
+
+
+def iter_custom_attribute_values(session, attr_ids, entity_ids):
+    """Iterate over custom attribute values from ftrack database.
+
+    Values are queried in chunks and yielded one by one, so all values
+    don't have to be held in memory at once. Passed ids are deduplicated
+    before chunks are created.
+
+    Args:
+        session (ftrack_api.Session): Connected ftrack session.
+        attr_ids (Iterable[str]): Attribute configuration ids.
+        entity_ids (Iterable[str]): Entity ids for which are values queried.
+
+    Yields:
+        Dict[str, Any]: Custom attribute value item from server.
+    """
+
+    attr_ids = set(attr_ids)
+    entity_ids = set(entity_ids)
+    # Just skip
+    if not attr_ids or not entity_ids:
+        return
+
+    # Prepare query template with attribute ids filled only once
+    query_template = (
+        "select value, entity_id, configuration_id"
+        " from CustomAttributeValue"
+        " where entity_id in ({{}}) and configuration_id in ({})"
+    ).format(join_filter_values(attr_ids))
+
+    chunk_size = max(1, CUST_ATTR_VALUES_QUERY_LIMIT // len(attr_ids))
+    # Each entity can have only one value per attribute, so page size
+    #   big enough to fetch whole chunk at once is known upfront
+    #   - ftrack api would otherwise fetch results in pages of 500 items
+    page_size = chunk_size * len(attr_ids)
+    for chunk in create_chunks(entity_ids, chunk_size):
+        yield from session.query(
+            query_template.format(join_filter_values(chunk)),
+            page_size=page_size
+        )
 
 
 def query_custom_attribute_values(session, attr_ids, entity_ids):
@@ -77,31 +211,9 @@ def query_custom_attribute_values(session, attr_ids, entity_ids):
         List[Dict[str, Any]]: Results from server.
     """
 
-    output = []
-    # Just skip
-    attr_ids = set(attr_ids)
-    entity_ids = set(entity_ids)
-    if not attr_ids or not entity_ids:
-        return output
-
-    # Prepare values to query
-    attributes_joined = join_filter_values(attr_ids)
-
-    # Query values in chunks
-    chunk_size = 5000 // len(attr_ids)
-    # Make sure entity_ids is `list` for chunk selection
-    for chunk in create_chunks(entity_ids, chunk_size):
-        entity_ids_joined = join_filter_values(chunk)
-        output.extend(
-            session.query(
-                (
-                    "select value, entity_id, configuration_id"
-                    " from CustomAttributeValue"
-                    " where entity_id in ({}) and configuration_id in ({})"
-                ).format(entity_ids_joined, attributes_joined)
-            ).all()
-        )
-    return output
+    return list(
+        iter_custom_attribute_values(session, attr_ids, entity_ids)
+    )
 
 
 def get_custom_attributes_by_entity_id(
@@ -144,7 +256,7 @@ def get_custom_attributes_by_entity_id(
         for attr_conf in itertools.chain(attr_configs, hier_attr_configs)
     }
 
-    value_items = query_custom_attribute_values(
+    value_items = iter_custom_attribute_values(
         session, attr_by_id.keys(), entity_ids
     )
 
@@ -1,8 +1,8 @@
 import os
 import sys
-import types
 import logging
 import importlib
+import importlib.util
 
 
 def import_filepath(filepath, module_name=None):
@@ -21,14 +21,11 @@ def import_filepath(filepath, module_name=None):
     # Make sure it is not 'unicode' in Python 2
     module_name = str(module_name)
 
-    # Prepare module object where content of file will be parsed
-    module = types.ModuleType(module_name)
-
-    # Use loader so module has full specs
-    module_loader = importlib.machinery.SourceFileLoader(
-        module_name, filepath
-    )
-    module_loader.exec_module(module)
+    # Use spec so module has full specs and cached bytecode in
+    #   '__pycache__' is used when available
+    spec = importlib.util.spec_from_file_location(module_name, filepath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
     return module
 
 
@@ -133,6 +133,7 @@ from ayon_ftrack.common import (
     CUST_ATTR_TOOLS,
 
     default_custom_attributes_definition,
+    invalidate_ayon_attr_configs_cache,
     app_definitions_from_app_manager,
     tool_definitions_from_app_manager,
 )
@@ -397,6 +398,8 @@ class CustomAttributes(LocalAction):
             job["status"] = job_status
 
             session.commit()
+            # Custom attribute configurations were changed
+            invalidate_ayon_attr_configs_cache(session)
 
         return output
 
@@ -3,6 +3,8 @@ import collections
 import json
 import time
 import atexit
+import logging
+import datetime
 
 import arrow
 import ftrack_api
@@ -86,6 +88,8 @@ class SyncProcess:
         "config",
         "default"
     ]
+    # Number of ftrack operations sent in one commit
+    commit_operations_chunk_size = 500
 
     def __init__(self, event_handler, session, event, log):
         self.event_handler = event_handler
@@ -117,6 +121,8 @@ class SyncProcess:
         self._ft_cust_attrs = None
         self._ft_hier_cust_attrs = None
         self._ft_std_cust_attrs = None
+        self._ft_hier_cust_attrs_by_id = None
+        self._ft_std_cust_attrs_by_id = None
         self._ft_object_type_name_by_id = None
         self._ft_task_type_name_by_id = None
         self._ft_status_names_by_id = None
@@ -389,6 +395,27 @@ class SyncProcess:
 
         return self._ft_std_cust_attrs
 
+    @property
+    def ft_hier_cust_attrs_by_id(self):
+        if self._ft_hier_cust_attrs_by_id is None:
+            self._ft_hier_cust_attrs_by_id = {
+                attr["id"]: attr
+                for attr in self.ft_hier_cust_attrs.values()
+            }
+        return self._ft_hier_cust_attrs_by_id
+
+    @property
+    def ft_std_cust_attrs_by_id(self):
+        if self._ft_std_cust_attrs_by_id is None:
+            ft_std_cust_attrs_by_id = collections.defaultdict(dict)
+            for object_type_id, attrs in self.ft_std_cust_attrs.items():
+                ft_std_cust_attrs_by_id[object_type_id] = {
+                    attr["id"]: attr
+                    for attr in attrs.values()
+                }
+            self._ft_std_cust_attrs_by_id = ft_std_cust_attrs_by_id
+        return self._ft_std_cust_attrs_by_id
+
     @property
     def ft_object_type_name_by_id(self):
         if self._ft_object_type_name_by_id is None:
@@ -734,16 +761,10 @@ class SyncProcess:
             if item["type"] != "Project"
         ])
 
-        hier_attrs_by_id = {
-            attr["id"]: attr
-            for attr in self.ft_hier_cust_attrs.values()
-        }
+        hier_attrs_by_id = self.ft_hier_cust_attrs_by_id
         obj_type_id = ft_entity["object_type_id"]
-        std_attrs_by_id = {
-            attr["id"]: attr
-            for attr in self.ft_std_cust_attrs[obj_type_id].values()
-        }
-        attr_ids = set(hier_attrs_by_id.keys()) | set(std_attrs_by_id.keys())
+        std_attrs_by_id = self.ft_std_cust_attrs_by_id[obj_type_id]
+        attr_ids = hier_attrs_by_id.keys() | std_attrs_by_id.keys()
         value_items = query_custom_attribute_values(
             self.session, attr_ids, [ftrack_id]
         )
@@ -805,14 +826,8 @@ class SyncProcess:
 
     def _try_find_other_match(self, info, entity):
         parent_id = info["parentId"]
-        if parent_id == self.ft_project_id:
-            ft_parent = self.ft_project
-        else:
-            ft_parent = self.session.query((
-                "select id, name from TypedContext"
-                f" where id is {parent_id}"
-            )).first()
-
+        # Parents are prefetched in '_process_removed_hierarchy_changes'
+        ft_parent = self.get_ftrack_entity_by_id(parent_id)
         if ft_parent is None:
             return False
 
@@ -1042,8 +1057,10 @@ class SyncProcess:
         # - if removed entity has equivalent we can not remove it directly but
         #       look for "same name" (slugified) next to it if parent still
         #       exists (only if was not already synchronized).
-        removed_items = list(self.entities_by_action["remove"].values())
+        removed_by_ftrack_id = self.entities_by_action["remove"]
+        removed_items = list(removed_by_ftrack_id.values())
         removed_items.sort(key=lambda info: len(info["parents"]))
+        entities_to_process = []
         for info in reversed(removed_items):
             ftrack_id = info["entityId"]
             if info["entity_type"] == "Task":
@@ -1072,11 +1089,24 @@ class SyncProcess:
             # Skip if entity was not found
             if entity is None:
                 continue
-
+            entities_to_process.append((info, entity))
+
+        # Query parents of processed entities at once, they are used
+        #   to find other matching entity
+        # - removed parents can't be queried and don't have other children
+        self.get_ftrack_entity_by_ids({
+            info["parentId"]
+            for info, _ in entities_to_process
+            if info["parentId"] not in removed_by_ftrack_id
+        })
+        for info, entity in entities_to_process:
             # First try find different ftrack entity that can "replace" the
             #   entity instead of previous
             #   - e.g. 'sh-01' was removed but 'sh_01' is there
-            if self._try_find_other_match(info, entity):
+            if (
+                info["parentId"] not in removed_by_ftrack_id
+                and self._try_find_other_match(info, entity)
+            ):
                 continue
 
             if (
@@ -1501,11 +1531,16 @@ class SyncProcess:
     def _propagate_attrib_changes(self):
         std_cust_attr = self.ft_std_cust_attrs
         hier_cust_attr = self.ft_hier_cust_attrs
+        entity_hub = self.entity_hub
+        convert_value = self._convert_value_by_cust_attr_conf
 
         # Prepare all created ftrack ids
         # - in that case it is not needed to update attributes as they have
         #   set all attributes from ftrack
         created_ftrack_ids = set(self._created_entity_by_ftrack_id.keys())
+        # Keys that are not propagated as custom attributes
+        default_attr_keys = DEFAULT_ATTRS_MAPPING.keys()
+        non_custom_keys = default_attr_keys | {"typeid", "statusid"}
         task_type_changes = {}
         status_changes = {}
         for ftrack_id, info in self.entities_by_action["update"].items():
@@ -1514,7 +1549,7 @@ class SyncProcess:
 
             object_type_id = None
             if info["entityType"] == "show":
-                entity = self.entity_hub.project_entity
+                entity = entity_hub.project_entity
 
             elif info["entityType"] == "task":
                 object_type_id = info["objectTypeId"]
@@ -1529,44 +1564,54 @@ class SyncProcess:
                     continue
 
                 entity_id = entity_ids[0]
-                entity = self.entity_hub.get_or_query_entity_by_id(
+                entity = entity_hub.get_or_query_entity_by_id(
                     entity_id, entity_types)
 
             else:
                 continue
 
-            for key, change_info in info["changes"].items():
-                value = change_info["new"]
-                if key == "typeid":
-                    if entity.entity_type == "task":
-                        task_type_changes[ftrack_id] = (entity, info)
-                    continue
+            changes = info["changes"]
+            if "typeid" in changes and entity.entity_type == "task":
+                task_type_changes[ftrack_id] = (entity, info)
 
-                if key == "statusid":
-                    status_changes[ftrack_id] = (entity, info)
-                    continue
+            if "statusid" in changes:
+                status_changes[ftrack_id] = (entity, info)
 
-                default_attr_key = DEFAULT_ATTRS_MAPPING.get(key)
+            attribs = entity.attribs
+            change_keys = changes.keys()
+            for key in change_keys & default_attr_keys:
+                dst_key = DEFAULT_ATTRS_MAPPING[key]
+                if dst_key not in attribs:
+                    continue
 
-                if default_attr_key is not None:
-                    dst_key = default_attr_key
-                elif key == CUST_ATTR_TOOLS:
+                value = changes[key]["new"]
+                if value is not None and key in ("startdate", "enddate"):
+                    # Parse with stdlib which is much faster than arrow,
+                    #   arrow is used only as fallback for other formats
+                    try:
+                        date = datetime.datetime.fromisoformat(value)
+                    except (TypeError, ValueError):
+                        date = arrow.get(value).datetime
+
+                    if date.tzinfo is None:
+                        date = date.replace(tzinfo=datetime.timezone.utc)
+                    # Shift date to 00:00:00 of the day
+                    # - ftrack is returning e.g. '2024-10-29T22:00:00'
+                    #  for '2024-10-30'
+                    date += datetime.timedelta(hours=24 - date.hour)
+                    value = date.isoformat()
+                attribs[dst_key] = value
+
+            for key in change_keys - non_custom_keys:
+                dst_key = key
+                if key == CUST_ATTR_TOOLS:
                     dst_key = "tools"
-                else:
-                    dst_key = key
 
-                if dst_key not in entity.attribs:
+                if dst_key not in attribs:
                     continue
 
-                if default_attr_key is not None:
-                    if value is not None and key in ("startdate", "enddate"):
-                        date = arrow.get(value)
-                        # Shift date to 00:00:00 of the day
-                        # - ftrack is returning e.g. '2024-10-29T22:00:00'
-                        #  for '2024-10-30'
-                        value = str(date.shift(hours=24 - date.hour))
-
-                elif value is not None:
+                value = changes[key]["new"]
+                if value is not None:
                     if key in FPS_KEYS:
                         value = convert_to_fps(value)
                     else:
@@ -1575,10 +1620,9 @@ class SyncProcess:
                             attr = std_cust_attr[object_type_id].get(key)
                             if attr is None:
                                 continue
-                        value = self._convert_value_by_cust_attr_conf(
-                            value, attr)
+                        value = convert_value(value, attr)
 
-                entity.attribs[dst_key] = value
+                attribs[dst_key] = value
 
         self._propagate_task_type_changes(task_type_changes)
         self._propagate_status_changes(status_changes)
@@ -1594,7 +1638,7 @@ class SyncProcess:
         ).all()
         ayon_user_by_ftrack_id = map_ftrack_users_to_ayon_users(ftrack_users)
 
-        ent_info_by_task_id = {}
+        ent_info_by_task_id = collections.defaultdict(list)
         for ent_info in assignee_changes.values():
             changes = ent_info["changes"]
             user_id_changes = changes["resource_id"]
@@ -1604,7 +1648,7 @@ class SyncProcess:
                 continue
             task_id_changes = changes["context_id"]
             task_id = task_id_changes["new"] or task_id_changes["old"]
-            ent_info_by_task_id.setdefault(task_id, []).append(ent_info)
+            ent_info_by_task_id[task_id].append(ent_info)
 
         for task_id, ent_infos in ent_info_by_task_id.items():
             entity_ids = self.task_ids_by_ftrack_id[task_id]
@@ -1668,11 +1712,9 @@ class SyncProcess:
             self._hierarchy_changed_by_ftrack_id,
             self._remapped_entity_by_ftrack_id,
         ):
-            for ftrack_id, entity in source.items():
-                entities_by_ftrack_id[ftrack_id] = entity
+            entities_by_ftrack_id.update(source)
 
-        ftrack_ids = set(entities_by_ftrack_id.keys())
-        ftrack_ids |= self._ft_failed_sync_ids
+        ftrack_ids = self._ft_failed_sync_ids.union(entities_by_ftrack_id)
         if not ftrack_ids:
             return
 
@@ -1681,14 +1723,20 @@ class SyncProcess:
         # - they may be removed meanwhile this event is processed and ftrack
         #   session would crash if we would try to change custom attributes
         #   of not existing entities
-        ft_entities = self.session.query((
-            "select id from TypedContext"
-            f" where id in ({join_filter_values(ftrack_ids)})"
-        )).all()
-        ftrack_ids = {
-            ft_entity["id"]
-            for ft_entity in ft_entities
-        }
+        # - entities already queried during this event processing are
+        #   considered as existing
+        existing_ids = ftrack_ids & self._ftrack_entities_by_id.keys()
+        unknown_ids = ftrack_ids - existing_ids
+        if unknown_ids:
+            ft_entities = self.session.query((
+                "select id from TypedContext"
+                f" where id in ({join_filter_values(unknown_ids)})"
+            )).all()
+            existing_ids |= {
+                ft_entity["id"]
+                for ft_entity in ft_entities
+            }
+        ftrack_ids = existing_ids
         if not ftrack_ids:
             return
 
@@ -1718,46 +1766,40 @@ class SyncProcess:
             entity_id = item["entity_id"]
             current_values[entity_id][attr_id] = item["value"]
 
-        expected_values = {
-            ftrack_id: {}
-            for ftrack_id in ftrack_ids
-        }
+        operations = []
+        create_operation = self._create_ft_attr_operation
         for ftrack_id in ftrack_ids:
-            entity_values = expected_values[ftrack_id]
+            current_entity_values = current_values[ftrack_id]
             entity = entities_by_ftrack_id.get(ftrack_id)
             failed = entity is None
-            entity_values[fail_attr_id] = failed
+            entity_values = {fail_attr_id: failed}
             if failed:
                 # Limit attribute updates only to failed boolean if sync failed
                 # - we want to keep path and id to potentially fix the issue by
                 #   knowing the path (without ftrack path user may have issues
                 #   to recreate it)
                 # Set default values to avoid inheritance from parent
-                current_entity_values = current_values[ftrack_id]
-                for key, value in (
-                    (path_attr_id, ""),
-                    (server_id_attr_id, "")
-                ):
-                    if not current_entity_values.get(key):
-                        entity_values[key] = value
-                continue
+                if not current_entity_values.get(path_attr_id):
+                    entity_values[path_attr_id] = ""
+                if not current_entity_values.get(server_id_attr_id):
+                    entity_values[server_id_attr_id] = ""
 
-            # TODO we should probably add path to tasks too
-            # - what the format should look like?
-            path = ""
-            if entity.entity_type == "folder":
-                path = entity.path
-            entity_values[path_attr_id] = path
-            entity_values[server_id_attr_id] = entity.id
-
-        operations = []
-        for ftrack_id, entity_values in expected_values.items():
-            current_entity_values = current_values[ftrack_id]
+            else:
+                # TODO we should probably add path to tasks too
+                # - what the format should look like?
+                path = ""
+                if entity.entity_type == "folder":
+                    path = entity.path
+                entity_values[path_attr_id] = path
+                entity_values[server_id_attr_id] = entity.id
+
+            # Create operations only for values that changed
+            get_current_value = current_entity_values.get
             for attr_id, value in entity_values.items():
-                cur_value = current_entity_values.get(attr_id)
+                cur_value = get_current_value(attr_id)
                 if value != cur_value:
                     operations.append(
-                        self._create_ft_attr_operation(
+                        create_operation(
                             attr_id,
                             ftrack_id,
                             attr_id not in current_entity_values,
@@ -1767,35 +1809,43 @@ class SyncProcess:
                     )
 
         if operations:
-            for chunk in create_chunks(operations, 500):
+            push_operation = self.session.recorded_operations.push
+            for chunk in create_chunks(
+                operations, self.commit_operations_chunk_size
+            ):
                 for operation in chunk:
-                    self.session.recorded_operations.push(operation)
+                    push_operation(operation)
                 self.session.commit()
 
     def process_event_data(self):
         # Check if auto-sync custom attribute exists
         entities_by_action = self.entities_by_action
-        debug_action_map = {
-            "add": "Created",
-            "remove": "Removed",
-            "update": "Updated",
-            "assignee_change": "Assignee changed",
-        }
-        debug_msg = "\n".join([
-            f"- {debug_action_map[action]}: {len(entities_info)}"
-            for action, entities_info in entities_by_action.items()
-        ])
+        debug_enabled = self.log.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            debug_action_map = {
+                "add": "Created",
+                "remove": "Removed",
+                "update": "Updated",
+                "assignee_change": "Assignee changed",
+            }
+            debug_msg = "\n".join([
+                f"- {debug_action_map[action]}: {len(entities_info)}"
+                for action, entities_info in entities_by_action.items()
+            ])
 
-        self.log.debug(
-            f"Project \"{self.project_name}\" changes\n{debug_msg}")
+            self.log.debug(
+                f"Project \"{self.project_name}\" changes\n{debug_msg}")
+
+        added_entities = entities_by_action["add"]
+        updated_entities = entities_by_action["update"]
+        assignee_changes = entities_by_action["assignee_change"]
 
         # Get ftrack entities - find all ftrack ids first
-        ftrack_ids = set()
-        for action in {"add", "update"}:
-            ftrack_ids |= set(entities_by_action[action].keys())
+        ftrack_ids = set(added_entities)
+        ftrack_ids.update(updated_entities)
 
         # Add task ids from assignees changes
-        for ent_info in entities_by_action["assignee_change"].values():
+        for ent_info in assignee_changes.values():
             context_id_changes = ent_info["changes"]["context_id"]
             ftrack_id = context_id_changes["new"] or context_id_changes["old"]
             ftrack_ids.add(ftrack_id)
@@ -1826,18 +1876,19 @@ class SyncProcess:
             #  - server id, server path, sync failed
             time_6 = time.time()
 
-            total_time = f"{time_6 - time_1:.2f}"
-            mid_times = ", ".join([
-                f"{diff:.2f}"
-                for diff in (
-                    time_2 - time_1,
-                    time_3 - time_2,
-                    time_4 - time_3,
-                    time_5 - time_4,
-                    time_6 - time_5,
-                )
-            ])
-            self.log.debug(f"Process time: {total_time} <{mid_times}>")
+            if debug_enabled:
+                total_time = f"{time_6 - time_1:.2f}"
+                mid_times = ", ".join([
+                    f"{diff:.2f}"
+                    for diff in (
+                        time_2 - time_1,
+                        time_3 - time_2,
+                        time_4 - time_3,
+                        time_5 - time_4,
+                        time_6 - time_5,
+                    )
+                ])
+                self.log.debug(f"Process time: {total_time} <{mid_times}>")
 
         except Exception:
             msg = "An error has happened during synchronization"
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Union
 
 import ayon_api
@@ -61,11 +62,15 @@ class SyncUsersFromFtrackEvent(BaseEventHandler):
         ).all()
         # Filter only private projects
         # - maybe it could be done in query?
-        project_ids_by_name = {
-            project["full_name"]: project["id"]
-            for project in projects
-            if project["is_private"]
-        }
+        project_ids_by_name = {}
+        project_name_by_id = {}
+        for project in projects:
+            if project["is_private"]:
+                project_id = project["id"]
+                project_name = project["full_name"]
+                project_ids_by_name[project_name] = project_id
+                project_name_by_id[project_id] = project_name
+
         if not project_ids_by_name:
             return
 
@@ -78,8 +83,9 @@ class SyncUsersFromFtrackEvent(BaseEventHandler):
         }
         filtered_project_ids = {
             project_ids_by_name[project_name]
-            for project_name in ayon_projects_names
-            if project_name in project_ids_by_name
+            for project_name in (
+                ayon_projects_names & project_ids_by_name.keys()
+            )
         }
         if not filtered_project_ids:
             return
@@ -106,25 +112,35 @@ class SyncUsersFromFtrackEvent(BaseEventHandler):
         users_mapping: Dict[str, Union[str, None]] = (
             map_ftrack_users_to_ayon_users(ftrack_users, ayon_users)
         )
-        project_name_by_id = {
-            project_id: project_name
-            for project_name, project_id in project_ids_by_name.items()
-        }
+        # Fetch full user data only for users with changes in filtered
+        #   projects, requests are sent in parallel
+        usernames = list({
+            ayon_username
+            for ftrack_id, ayon_username in users_mapping.items()
+            if (
+                ayon_username
+                and project_ids_by_user_id[ftrack_id].keys()
+                & filtered_project_ids
+            )
+        })
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            full_ayon_users_by_name = dict(zip(
+                usernames, executor.map(ayon_api.get_user, usernames)
+            ))
+
         for ftrack_id, ayon_username in users_mapping.items():
             # Mapping was not found - ignore
             if not ayon_username:
                 continue
 
             removed_by_project_id = project_ids_by_user_id[ftrack_id]
-            filtered_project_ids = {
-                project_id
-                for project_id in removed_by_project_id
-                if project_id in filtered_project_ids
-            }
-            if not filtered_project_ids:
+            user_project_ids = (
+                removed_by_project_id.keys() & filtered_project_ids
+            )
+            if not user_project_ids:
                 continue
 
-            ayon_user = ayon_api.get_user(ayon_username)
+            ayon_user = full_ayon_users_by_name[ayon_username]
             user_data = ayon_user["data"]
             default_user_access_groups = user_data.get(
                 "defaultAccessGroups", []
@@ -132,10 +148,7 @@ class SyncUsersFromFtrackEvent(BaseEventHandler):
             user_access_groups = user_data.setdefault("accessGroups", {})
 
             changed = False
-            for project_id in filtered_project_ids:
-                if project_id not in removed_by_project_id:
-                    continue
-
+            for project_id in user_project_ids:
                 removed: bool = removed_by_project_id[project_id]
                 project_name = project_name_by_id[project_id]
                 if removed and project_name not in user_access_groups:
@@ -1,4 +1,6 @@
 import os
+import io
+import re
 import sys
 import shutil
 import uuid
@@ -8,6 +10,8 @@ import time
 import json
 import tarfile
 import zipfile
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 import platformdirs
 import ayon_api
@@ -15,13 +19,44 @@ import ayon_api
 IMPLEMENTED_ARCHIVE_FORMATS = {
     ".zip", ".tar", ".tgz", ".tar.gz", ".tar.xz", ".tar.bz2"
 }
+_ARCHIVE_TYPE_BY_EXT = {
+    ext: "zip" if ext == ".zip" else "tar"
+    for ext in IMPLEMENTED_ARCHIVE_FORMATS
+}
+# Longer extensions first so the most specific match is used
+_ARCHIVE_EXTS_BY_LENGTH = tuple(
+    sorted(IMPLEMENTED_ARCHIVE_FORMATS, key=len, reverse=True)
+)
 PROCESS_ID = uuid.uuid4().hex
 # Wait 1 hour before cleaning up download dir
-# - Running process should update lock file every 1 second
+# - Running process should update lock file every 30 seconds
 _LOCK_CLEANUP_TIME = 60 * 60
+_LOCK_UPDATE_INTERVAL = 30
+# Maximum number of event handler archives downloaded at the same time
+_MAX_DOWNLOAD_WORKERS = 8
+# Read buffer size used for archive files (1 MiB)
+_ARCHIVE_READ_BUFFER_SIZE = 1024 * 1024
+# Minimum number of zip members per thread for parallel extraction
+_PARALLEL_ZIP_MIN_MEMBERS = 64
+# Magic bytes of compressed tar archives
+_TAR_MAGIC_GZ = b"\x1f\x8b"
+_TAR_MAGIC_XZ = b"\xfd7zXZ\x00"
+_TAR_MAGIC_BZ2 = b"BZh"
+# Highest supported version of event handlers manifest
+_MAX_MANIFEST_VERSION = (1, 0, 0)
+_MANIFEST_VERSION_REGEX = re.compile(r"^(\d+)\.(\d+)\.(\d+)$")
+
+
+@functools.lru_cache(maxsize=1)
+def get_download_root():
+    """Root directory where event handlers are downloaded.
 
+    Result is cached, changes of 'AYON_FTRACK_DOWNLOAD_ROOT' after first
+    call are ignored.
 
-def get_download_root():
+    Returns:
+        str: Path to download root.
+    """
     root = os.getenv("AYON_FTRACK_DOWNLOAD_ROOT")
     if not root:
         root = os.path.join(
@@ -42,29 +77,112 @@ def get_archive_ext_and_type(archive_file):
     """
 
     tmp_name = archive_file.lower()
-    if tmp_name.endswith(".zip"):
-        return ".zip", "zip"
-
-    for ext in (
-        ".tar",
-        ".tgz",
-        ".tar.gz",
-        ".tar.xz",
-        ".tar.bz2",
-    ):
+    for ext in _ARCHIVE_EXTS_BY_LENGTH:
         if tmp_name.endswith(ext):
-            return ext, "tar"
+            return ext, _ARCHIVE_TYPE_BY_EXT[ext]
 
     return None, None
 
 
-def extract_archive_file(archive_file, dst_folder=None):
+def _extract_zip_members(content, members, dst_folder):
+    # Each thread must use own 'ZipFile' object
+    with zipfile.ZipFile(io.BytesIO(content)) as zip_file:
+        zip_file.extractall(dst_folder, members=members)
+
+
+def _extract_zip_stream(stream, dst_folder):
+    with zipfile.ZipFile(stream) as zip_file:
+        members = zip_file.infolist()
+        workers_count = min(
+            os.cpu_count() or 1,
+            len(members) // _PARALLEL_ZIP_MIN_MEMBERS
+        )
+        # Parallel extraction is used only for archives with many members
+        #   and with safe paths, so parent directories can be created
+        #   upfront
+        for member in members:
+            filename = member.filename
+            if (
+                os.path.isabs(filename)
+                or ".." in filename.replace("\\", "/").split("/")
+            ):
+                workers_count = 0
+                break
+
+        if workers_count < 2:
+            zip_file.extractall(dst_folder)
+            return
+
+    # Create directories upfront to avoid race conditions between threads
+    for member in members:
+        dirname = os.path.dirname(member.filename)
+        if dirname:
+            os.makedirs(os.path.join(dst_folder, dirname), exist_ok=True)
+
+    stream.seek(0)
+    content = stream.read()
+    with ThreadPoolExecutor(max_workers=workers_count) as executor:
+        futures = [
+            executor.submit(
+                _extract_zip_members,
+                content,
+                members[idx::workers_count],
+                dst_folder
+            )
+            for idx in range(workers_count)
+        ]
+        for future in futures:
+            future.result()
+
+
+def _detect_tar_compression(stream):
+    """Detect compression of tar archive stream from magic bytes.
+
+    Stream position is restored after detection.
+
+    Args:
+        stream (BinaryIO): Stream with tar archive content.
+
+    Returns:
+        str: Compression name usable in tarfile mode, empty string for
+            uncompressed archive.
+    """
+    position = stream.tell()
+    header = stream.read(len(_TAR_MAGIC_XZ))
+    stream.seek(position)
+    if header.startswith(_TAR_MAGIC_GZ):
+        return "gz"
+    if header.startswith(_TAR_MAGIC_XZ):
+        return "xz"
+    if header.startswith(_TAR_MAGIC_BZ2):
+        return "bz2"
+    return ""
+
+
+def _extract_archive_stream(stream, archive_type, dst_folder):
+    if archive_type == "zip":
+        _extract_zip_stream(stream, dst_folder)
+
+    elif archive_type == "tar":
+        # Use streaming mode, content is read only once without seeking
+        tar_mode = f"r|{_detect_tar_compression(stream)}"
+        with tarfile.open(
+            fileobj=stream,
+            mode=tar_mode,
+            bufsize=_ARCHIVE_READ_BUFFER_SIZE,
+        ) as tar_file:
+            tar_file.extractall(dst_folder)
+
+
+def extract_archive_file(archive_file, dst_folder=None, stream=None):
     """Extract archived file to a directory.
 
     Args:
         archive_file (str): Path to a archive file.
         dst_folder (Optional[str]): Directory where content will be extracted.
             By default, same folder where archive file is.
+        stream (Optional[BinaryIO]): Stream with archive content. The
+            archive file is used only to define archive type when passed.
 
     """
     if not dst_folder:
@@ -72,7 +190,7 @@ def extract_archive_file(archive_file, dst_folder=None):
 
     os.makedirs(dst_folder, exist_ok=True)
 
-    archive_ext, archive_type = get_archive_ext_and_type(archive_file)
+    _, archive_type = get_archive_ext_and_type(archive_file)
 
     print(f"Extracting {archive_file} -> {dst_folder}")
     if archive_type is None:
@@ -82,24 +200,15 @@ def extract_archive_file(archive_file, dst_folder=None):
             f" Expected {', '.join(IMPLEMENTED_ARCHIVE_FORMATS)}"
         ))
 
-    if archive_type == "zip":
-        with zipfile.ZipFile(archive_file) as zip_file:
-            zip_file.extractall(dst_folder)
+    if stream is not None:
+        _extract_archive_stream(stream, archive_type, dst_folder)
+        return
 
-    elif archive_type == "tar":
-        if archive_ext == ".tar":
-            tar_type = "r:"
-        elif archive_ext.endswith(".xz"):
-            tar_type = "r:xz"
-        elif archive_ext.endswith(".gz"):
-            tar_type = "r:gz"
-        elif archive_ext.endswith(".bz2"):
-            tar_type = "r:bz2"
-        else:
-            tar_type = "r:*"
-
-        with tarfile.open(archive_file, tar_type) as tar_file:
-            tar_file.extractall(dst_folder)
+    # Use bigger read buffer than default to reduce number of read calls
+    with open(
+        archive_file, "rb", buffering=_ARCHIVE_READ_BUFFER_SIZE
+    ) as stream:
+        _extract_archive_stream(stream, archive_type, dst_folder)
 
 
 class _LockThread(threading.Thread):
@@ -107,18 +216,29 @@ class _LockThread(threading.Thread):
         super().__init__()
         self.lock_file = lock_file
         self._event = threading.Event()
-        self.interval = 1
+        self.interval = _LOCK_UPDATE_INTERVAL
 
     def stop(self):
         if not self._event.is_set():
             self._event.set()
 
+    def _write_timestamp(self, fd):
+        data = str(time.time()).encode()
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, data)
+        # Make sure there are no leftovers of previous longer value
+        os.ftruncate(fd, len(data))
+
     def run(self):
-        with open(self.lock_file, "w") as stream:
+        fd = os.open(self.lock_file, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            # Write timestamp right away so the lock file is never empty
+            #   while the thread is running
+            self._write_timestamp(fd)
             while not self._event.wait(self.interval):
-                stream.seek(0)
-                stream.write(str(time.time()))
-                stream.flush()
+                self._write_timestamp(fd)
+        finally:
+            os.close(fd)
 
 
 @contextlib.contextmanager
@@ -132,52 +252,152 @@ def _lock_file_update(lock_file):
         thread.join()
 
 
+def _download_event_handlers_archive(custom_handler):
+    """Download archive with event handlers of an addon to memory.
+
+    Archive is not stored to disk, it is extracted directly from the stream.
+
+    Args:
+        custom_handler (dict[str, str]): Custom handler information.
+
+    Returns:
+        Union[io.BytesIO, None]: Stream with archive content or None if
+            download failed.
+    """
+    addon_name = custom_handler["addon_name"]
+    addon_version = custom_handler["addon_version"]
+    endpoint = custom_handler["endpoint"]
+    url = "/".join([ayon_api.get_base_url(), endpoint])
+    stream = io.BytesIO()
+    try:
+        ayon_api.download_file_to_stream(url, stream)
+
+    except BaseException as exc:
+        print(
+            "Failed to download event handlers"
+            f" for {addon_name} {addon_version}"
+            f"from '{endpoint}'. Reason: {exc}"
+        )
+        return None
+    stream.seek(0)
+    return stream
+
+
+def _read_zip_manifest(stream):
+    """Read manifest from zip archive stream without extracting the archive.
+
+    Zip central directory allows to read single file without decompressing
+    the whole archive.
+
+    Args:
+        stream (BinaryIO): Stream with zip archive content.
+
+    Returns:
+        Union[dict[str, Any], None]: Manifest data or None if archive does
+            not contain manifest file.
+    """
+    try:
+        with zipfile.ZipFile(stream) as zip_file:
+            try:
+                content = zip_file.read("manifest.json")
+            except KeyError:
+                return None
+    finally:
+        stream.seek(0)
+    return json.loads(content)
+
+
+def _read_extracted_manifest(extract_dir):
+    """Read manifest from directory with extracted archive.
+
+    Args:
+        extract_dir (str): Directory where archive was extracted.
+
+    Returns:
+        Union[dict[str, Any], None]: Manifest data or None if manifest file
+            does not exist.
+    """
+    manifest_file = os.path.join(extract_dir, "manifest.json")
+    if not os.path.exists(manifest_file):
+        return None
+
+    with open(manifest_file, "r") as stream:
+        return json.load(stream)
+
+
+def _is_manifest_valid(manifest, endpoint):
+    """Check if manifest exists and has supported version.
+
+    Args:
+        manifest (Union[dict[str, Any], None]): Manifest data.
+        endpoint (str): Endpoint from which archive was downloaded.
+
+    Returns:
+        bool: Manifest can be processed.
+    """
+    if manifest is None:
+        print(
+            f"Manifest file not found in"
+            f" downloaded archive from {endpoint}"
+        )
+        return False
+
+    manifest_version = manifest["version"]
+    version_match = _MANIFEST_VERSION_REGEX.match(manifest_version)
+    if (
+        version_match is None
+        or tuple(map(int, version_match.groups())) > _MAX_MANIFEST_VERSION
+    ):
+        print(
+            f"Manifest file has unknown version {manifest_version}."
+            " Skipping."
+        )
+        return False
+    return True
+
+
 def _download_event_handlers(dirpath, custom_handlers, event_handler_dirs):
-    for custom_handler in custom_handlers:
+    # Download archives in parallel, extraction is done in order of
+    #   custom handlers to keep order of handler dirs and python paths
+    max_workers = min(_MAX_DOWNLOAD_WORKERS, len(custom_handlers))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        streams = list(executor.map(
+            _download_event_handlers_archive, custom_handlers
+        ))
+
+    # Python paths are added to 'sys.path' at once in declared order
+    python_paths = []
+    existing_paths = set(sys.path)
+    for custom_handler, stream in zip(custom_handlers, streams):
+        if stream is None:
+            continue
+
         addon_name = custom_handler["addon_name"]
         addon_version = custom_handler["addon_version"]
         endpoint = custom_handler["endpoint"]
         filename = endpoint.rsplit("/")[-1]
-        path = os.path.join(dirpath, filename)
-        url = "/".join([ayon_api.get_base_url(), endpoint])
         try:
-            ayon_api.download_file(url, path)
-
-        except BaseException as exc:
-            print(
-                "Failed to download event handlers"
-                f" for {addon_name} {addon_version}"
-                f"from '{endpoint}'. Reason: {exc}"
-            )
-            continue
+            _, archive_type = get_archive_ext_and_type(filename)
+            manifest = None
+            if archive_type == "zip":
+                # Validate manifest before the archive is extracted
+                manifest = _read_zip_manifest(stream)
+                if not _is_manifest_valid(manifest, endpoint):
+                    continue
 
-        try:
             # Create temp dir for event handlers
             subdir = f"{addon_name}_{addon_version}"
             extract_dir = os.path.join(dirpath, subdir)
             # Extract downloaded archive
-            extract_archive_file(path, extract_dir)
-            manifest_file = os.path.join(extract_dir, "manifest.json")
-            if not os.path.exists(manifest_file):
-                print(
-                    f"Manifest file not found in"
-                    f" downloaded archive from {endpoint}"
-                )
-                continue
-
-            with open(manifest_file, "r") as stream:
-                manifest = json.load(stream)
-
-            manifest_version = manifest["version"]
-            maj_v, min_v, patch_v = (
-                int(part) for part in manifest_version.split(".")
-            )
-            if (maj_v, min_v, patch_v) > (1, 0, 0):
-                print(
-                    f"Manifest file has unknown version {manifest_version}."
-                    " Trying to process it anyway."
-                )
-                continue
+            extract_archive_file(filename, extract_dir, stream=stream)
+
+            if archive_type != "zip":
+                # Tar archives are read only once, by streaming extraction,
+                #   so manifest is validated after extraction
+                manifest = _read_extracted_manifest(extract_dir)
+                if not _is_manifest_valid(manifest, endpoint):
+                    shutil.rmtree(extract_dir)
+                    continue
 
             for even_handler_subpath in manifest.get("handler_subfolders", []):
                 # Add path to event handler dirs
@@ -187,14 +407,18 @@ def _download_event_handlers(dirpath, custom_handlers, event_handler_dirs):
 
             for python_subpath in manifest.get("python_path_subfolders", []):
                 python_dir = os.path.join(extract_dir, python_subpath)
-                sys.path.insert(0, python_dir)
+                if python_dir not in existing_paths:
+                    existing_paths.add(python_dir)
+                    python_paths.append(python_dir)
 
         except BaseException as exc:
             print(f"Failed to extract downloaded archive: {exc}")
 
         finally:
-            # Remove archive
-            os.remove(path)
+            stream.close()
+
+    if python_paths:
+        sys.path[:0] = python_paths
 
 
 @contextlib.contextmanager
@@ -228,10 +452,14 @@ def cleanup_download_root():
 
     current_time = time.time()
     paths_to_remove = []
-    for subdir in os.listdir(root):
-        path = os.path.join(root, subdir)
-        if not os.path.isdir(path):
-            continue
+    with os.scandir(root) as entries:
+        dir_paths = [
+            entry.path
+            for entry in entries
+            if entry.is_dir(follow_symlinks=False)
+        ]
+
+    for path in dir_paths:
         lock_file = os.path.join(path, "lock")
         if not os.path.exists(lock_file):
             paths_to_remove.append(path)
@@ -254,6 +482,15 @@ def cleanup_download_root():
         if (current_time - last_update) > _LOCK_CLEANUP_TIME:
             paths_to_remove.append(path)
 
+    if not paths_to_remove:
+        return
+
     for path in paths_to_remove:
         print(f"Cleaning up download directory: {path}")
-        shutil.rmtree(path)
+
+    # Stale directories are independent of each other, remove them
+    #   concurrently so a slow filesystem does not block on each one
+    workers_count = min(_MAX_DOWNLOAD_WORKERS, len(paths_to_remove))
+    with ThreadPoolExecutor(max_workers=workers_count) as executor:
+        for _ in executor.map(shutil.rmtree, paths_to_remove):
+            pass
@@ -4,7 +4,6 @@ import getpass
 import atexit
 import threading
 import time
-import queue
 import collections
 
 import appdirs
@@ -29,10 +28,27 @@ from ayon_api import (
 
 # 10 minutes
 EVENT_PROCESS_TIMEOUT = 60 * 10
+# Sleep time range (in seconds) when there are no jobs to process
+# - sleep time is doubled with each empty check up to max value
+IDLE_SLEEP_MIN = 0.1
+IDLE_SLEEP_MAX = 2
+# Default directory of ftrack api schema cache file
+# - resolved only once per process
+SCHEMA_CACHE_DIR = (
+    os.environ.get("FTRACK_API_SCHEMA_CACHE_PATH")
+    or appdirs.user_cache_dir()
+)
+# Loaded schemas and built entity types by server url, cache path and
+#   server schema hash
+# - avoid parsing schemas and building types for each new session
+# - schema change on server invalidates cached schemas
+_SCHEMA_CACHE = {}
 
 
 class ProcessEventHub(ftrack_api.event.hub.EventHub):
     _server_con = None
+    # Packet code of 'event' packets, resolved on first packet
+    _event_code = None
 
     def get_next_ftrack_event(self):
         if not self.connected:
@@ -78,34 +94,35 @@ class ProcessEventHub(ftrack_api.event.hub.EventHub):
 
         started = time.time()
         last_loaded_job = 0
+        idle_sleep = IDLE_SLEEP_MIN
         while True:
-            job = None
-            empty_queue = False
-            try:
-                item = self._event_queue.get(timeout=0.1)
-                if isinstance(item, tuple):
-                    event, job = item
-                else:
-                    event = item
-
-            except queue.Empty:
-                empty_queue = True
-
-            # Do not do this under except handling to avoid confusing
-            #   traceback if something happens
-            if empty_queue:
+            # This is the only consumer of the queue, so it is safe to check
+            #   emptiness first instead of handling 'queue.Empty' exception
+            #   on each idle iteration
+            if self._event_queue.empty():
                 if not self.connected:
                     break
 
                 if self.load_event_from_jobs():
                     last_loaded_job = time.time()
+                    idle_sleep = IDLE_SLEEP_MIN
                 elif time.time() - last_loaded_job > 5 * 60:
                     if not self._check_stuck_events():
                         time.sleep(5)
                 else:
-                    time.sleep(0.1)
+                    time.sleep(idle_sleep)
+                    idle_sleep = min(idle_sleep * 2, IDLE_SLEEP_MAX)
                 continue
 
+            job = None
+            item = self._event_queue.get_nowait()
+            if isinstance(item, tuple):
+                event, job = item
+            else:
+                event = item
+
+            idle_sleep = IDLE_SLEEP_MIN
+
             self._handle(event)
 
             if job is not None:
@@ -121,8 +138,13 @@ class ProcessEventHub(ftrack_api.event.hub.EventHub):
 
     def _handle_packet(self, code, packet_identifier, path, data):
         """Override `_handle_packet` which skip events and extend heartbeat"""
-        code_name = self._code_name_mapping[code]
-        if code_name == "event":
+        event_code = self._event_code
+        if event_code is None:
+            # Code name mapping contains also mapping of names to codes
+            event_code = self._code_name_mapping["event"]
+            self._event_code = event_code
+
+        if code == event_code:
             return
 
         return super()._handle_packet(code, packet_identifier, path, data)
@@ -289,17 +311,28 @@ class CustomEventHubSession(ftrack_api.session.Session):
         # rebuilding types)?
         if schema_cache_path is not False:
             if schema_cache_path is None:
-                schema_cache_path = appdirs.user_cache_dir()
-                schema_cache_path = os.environ.get(
-                    "FTRACK_API_SCHEMA_CACHE_PATH", schema_cache_path
-                )
+                schema_cache_path = SCHEMA_CACHE_DIR
 
             schema_cache_path = os.path.join(
                 schema_cache_path, "ftrack_api_schema_cache.json"
             )
 
-        self.schemas = self._load_schemas(schema_cache_path)
-        self.types = self._build_entity_type_classes(self.schemas)
+        schema_cache_key = (
+            self._server_url,
+            schema_cache_path,
+            self._server_information.get("schema_hash"),
+        )
+        cached_schemas = _SCHEMA_CACHE.get(schema_cache_key)
+        if cached_schemas is None:
+            schemas = self._load_schemas(schema_cache_path)
+            types = self._build_entity_type_classes(schemas)
+            cached_schemas = (schemas, types)
+            # Drop schemas of previous schema hash of the same server
+            for key in tuple(_SCHEMA_CACHE):
+                if key[:2] == schema_cache_key[:2]:
+                    _SCHEMA_CACHE.pop(key)
+            _SCHEMA_CACHE[schema_cache_key] = cached_schemas
+        self.schemas, self.types = cached_schemas
 
         ftrack_api._centralized_storage_scenario.register(self)
 